@@ -1,30 +1,31 @@
-import array
-import socket
 import struct
 
 # avoid references for performance reasons
 unpack = struct.unpack
 unpack_word_be = struct.Struct(">H").unpack
-array_call = array.array
-ntohs = socket.ntohs
+int_from_bytes = int.from_bytes
 
 # TCP (RFC 793) and UDP (RFC 768) checksum
 
 
 def in_cksum_add(s, buf):
-	"""Add checksum value to the given value s."""
-	n = len(buf)
-	# logger.debug("buflen for checksum: %d" % n)
-	cnt = int(n / 2) * 2
-	# logger.debug("slicing at: %d, %s" % (cnt, type(cnt)))
-	a = array_call("H", buf[:cnt])
-	# logger.debug("2-byte values: %s" % a)
-	# logger.debug(buf[-1].to_bytes(1, byteorder='big'))
+	"""
+	Add checksum value of buf to the given value s. buf gets padded using
+	a zero byte if its length is odd: only the last buffer may have an odd length.
+	"""
+	# 2^16 = 1 (mod 0xffff): the sum of all 16 bit words modulo 0xffff equals the buffer
+	# value as big integer modulo 0xffff. This avoids summing up words in Python.
+	val = int_from_bytes(buf, "big")
 
-	if cnt != n:
-		#a.append(unpack_word_be( buf[-1].to_bytes(1, byteorder="big") + b"\x00" )[0])
-		a.append(unpack_word_be(buf[-1:] + b"\x00")[0])
-	return s + sum(a)
+	if len(buf) & 1:
+		# same as padding by zero byte but without copying buf
+		val <<= 8
+	rem = val % 0xffff
+
+	if rem == 0 and val != 0:
+		# non-zero sums are represented as 0xffff in ones-complement
+		rem = 0xffff
+	return s + rem
 
 
 def in_cksum_done(s):
@@ -33,7 +34,7 @@ def in_cksum_done(s):
 	s = (s >> 16) + (s & 0xffff)
 	s += (s >> 16)
 	# return complement of sums
-	return ntohs(~s & 0xffff)
+	return ~s & 0xffff
 
 
 def in_cksum(buf):
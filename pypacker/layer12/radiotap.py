@@ -1,13 +1,18 @@
 """Radiotap"""
 from pypacker import pypacker, triggerlist
+import functools
+import operator
 import struct
 import logging
 
 logger = logging.getLogger("pypacker")
 
 # avoid references for performance reasons
-unpack_flags = struct.Struct(">I").unpack
-unpack_hdr_len = struct.Struct("<H").unpack
+unpack_flags = struct.Struct(">I").unpack_from
+unpack_hdr_len = struct.Struct("<H").unpack_from
+unpack_channelinfo = struct.Struct("<HH").unpack_from
+# (XXX_MASK, value) -> value
+get_flag_value = operator.itemgetter(1)
 
 RTAP_TYPE_80211 = 0
 
@@ -80,6 +85,9 @@ RADIO_FIELDS = {
 	# EXT_MASK		:
 }
 
+# alignment is calculated via bit operations: all alignments have to be a power of 2
+assert all(align & (align - 1) == 0 for size, align in RADIO_FIELDS.values())
+
 RADIO_FIELDS_MASKS = [
 	TSFT_MASK,
 	FLAGS_MASK,
@@ -108,18 +116,64 @@ RADIO_FIELDS_MASKS = [
 	VHT_MASK
 ]
 
+# mask -> (length, alignment, position in RADIO_FIELDS_MASKS)
+_MASK_META = {mask: RADIO_FIELDS[mask] + (idx,) for idx, mask in enumerate(RADIO_FIELDS_MASKS)}
+
+
+@functools.lru_cache(maxsize=256)
+def get_fields_layout(present_flags):
+	"""
+	Calculate the position of all fields stated by present_flags. The result is cached
+	as the same flag combinations appear over and over again in a capture.
+
+	present_flags -- present flags as read from the Radiotap header (big endian)
+	return -- (((mask, start, end), ...), flags_off): start/end are offsets relative to the
+		end of the static header, alignment padding is prepended to the field value.
+		flags_off is the offset of the FLAGS_MASK field or None if not present.
+	"""
+	# collect set bits only: typically just a handful out of all defined fields
+	present = []
+	bits = present_flags
+
+	while bits:
+		bit = bits & -bits
+		bits ^= bit
+		meta = _MASK_META.get(bit, None)
+		# reserved/namespace/extension bits have no field data we know of
+		if meta is not None:
+			present.append((meta[2], bit, meta[0], meta[1]))
+
+	# fields appear in the order of RADIO_FIELDS_MASKS
+	present.sort()
+	off = 0
+	fields = []
+	flags_off = None
+
+	for _, mask, size, align in present:
+		# round up to alignment (power of 2), padding gets prepended to the value
+		start = (off + align - 1) & -align
+
+		if mask == FLAGS_MASK:
+			flags_off = start
+		# logger.debug("got flag %02X, length/align: %r" % (mask, (size, align)))
+		fields.append((mask, off, start + size))
+		off = start + size
+	return tuple(fields), flags_off
+
 
 class FlagTriggerList(triggerlist.TriggerList):
+	__slots__ = []
+
 	# no __init__ needed: we just add tuples
 	def _pack(self):
-		return b"".join([flag[1] for flag in self])
+		return b"".join(map(get_flag_value, self))
 
 
 def get_channelinfo(channel_bytes):
 	"""
 	return -- [channel_mhz, channel_flags]
 	"""
-	return [struct.unpack("<H", channel_bytes[0:2])[0], struct.unpack("<H", channel_bytes[2:4])[0]]
+	return list(unpack_channelinfo(channel_bytes))
 
 
 class Radiotap(pypacker.Packet):
@@ -131,12 +185,11 @@ class Radiotap(pypacker.Packet):
 		("flags", None, FlagTriggerList)		# stores: (XXX_MASK, value)
 	)
 
-	# handle frame check sequence
+	# frame check sequence, empty if not present
+	_fcs = b""
+
 	def __get_fcs(self):
-		try:
-			return self._fcs
-		except AttributeError:
-			return b""
+		return self._fcs
 
 	def __set_fcs(self, fcs):
 		self._fcs = fcs
@@ -144,20 +197,17 @@ class Radiotap(pypacker.Packet):
 	fcs = property(__get_fcs, __set_fcs)
 
 	def _dissect(self, buf):
-		flags = self._present_flags = unpack_flags(buf[4:8])[0]
+		flags = self._present_flags = unpack_flags(buf, 4)[0]
+		fields, flags_off = get_fields_layout(flags)
 		pos_end = len(buf)
 
-		if flags & FLAGS_MASK == FLAGS_MASK:
-			off = 0
+		# FCS present? Flags field is located after the static header (8 bytes)
+		if flags_off is not None and buf[8 + flags_off] & 0x10 != 0:
+			logger.debug("fcs found")
+			self._fcs = buf[-4:]
+			pos_end = -4
 
-			if flags & TSFT_MASK == TSFT_MASK:
-				off = 8
-			if buf[off] & 0x10 != 0:
-				logger.debug("fcs found")
-				self._fcs = buf[-4:]
-				pos_end = -4
-
-		hdr_len = unpack_hdr_len(buf[2:4])[0]
+		hdr_len = unpack_hdr_len(buf, 2)[0]
 		#logger.debug("hdr length is: %d" % hdr_len)
 		self._init_triggerlist("flags", buf[8: hdr_len], self._parse_flags)
 		# now we got the correct header length
@@ -166,43 +216,18 @@ class Radiotap(pypacker.Packet):
 		return hdr_len
 
 	def _parse_flags(self, buf):
-		off = 0
-		flags = []
-
-		# assume order of flags is correctly stated by "present_flags"
-		# we need to know if fcs is present: minimum TSFT and flags must get parsed
-		for mask in RADIO_FIELDS_MASKS:
-			#logger.debug(self.present_flags)
-			# flag not set
-			if mask & self.present_flags == 0:
-				continue
-
-			size_align = RADIO_FIELDS[mask]
-			size = size_align[0]
-			# check alignment
-			mod = off % size_align[1]
-
-			if mod != 0:
-				# enlarge size by alignment
-				size += (size_align[1] - mod)
-
-			# logger.debug("got flag %02X, length/align: %r" % (mask, size_align))
-			# add all fields for the stated flag
-			value = buf[off: off + size]
-
-			# FCS present?
-			if mask == FLAGS_MASK and struct.unpack(">B", value)[0] & 0x10 != 0:
-				# logger.debug("fcs found")
-				fcs_present = True
-
-			#logger.debug("adding flag: %s" % str(mask))
-			flags.append((mask, value))
-			off += size
-		return flags
+		fields = get_fields_layout(self.present_flags)[0]
+		return [(mask, buf[start: end]) for mask, start, end in fields]
 
 	def bin(self, update_auto_fields=True):
 		"""Custom bin(): handle FCS."""
-		return pypacker.Packet.bin(self, update_auto_fields=update_auto_fields) + self.fcs
+		bts = pypacker.Packet.bin(self, update_auto_fields=update_auto_fields)
+		fcs = self.fcs
+
+		if not fcs:
+			# avoid copying all bytes for nothing
+			return bts
+		return bts + fcs
 
 
 # load handler
@@ -14,8 +14,12 @@ import struct
 import logging
 
 # avoid unneeded references for performance reasons
-pack = struct.pack
-unpack = struct.unpack
+unpack_ports = struct.Struct(">HH").unpack_from
+# IP-pseudoheader: IP src, dst, \x00, UDP upper proto, length
+pack_pseudoheader_ip4 = struct.Struct(">4s4sBBH").pack
+pack_pseudoheader_ip6 = struct.Struct(">16s16sxBH").pack
+in_cksum_add = checksum.in_cksum_add
+in_cksum_done = checksum.in_cksum_done
 
 logger = logging.getLogger("pypacker")
 
@@ -39,37 +43,27 @@ class UDP(pypacker.Packet):
 			There is no update on user-set checksums.
 			"""
 			changed = self._changed()
-			update = True
 
 			if changed:
 				self.ulen = len(self)
 
-			try:
-				# changes to IP-layer, don't mind if this isn't IP
-				if not self._lower_layer._header_changed:
-					# lower layer doesn't need update, check for changes in present and upper layer
-					# logger.debug("lower layer did NOT change!")
-					update = changed
-			except AttributeError:
-				# assume not an IP packet: we can't calculate the checksum
-				update = False
-
-			if update:
+			lower_layer = self._lower_layer
+			# no lower layer: assume not an IP packet, we can't calculate the checksum
+			# lower layer doesn't need update: check for changes in present and upper layer
+			if lower_layer is not None and (changed or lower_layer._header_changed):
 				self._calc_sum()
 
 		return pypacker.Packet.bin(self, update_auto_fields=update_auto_fields)
 
 	def _dissect(self, buf):
-		ports = [unpack(">H", buf[0:2])[0], unpack(">H", buf[2:4])[0]]
-
-		try:
-			# source or destination port should match
-			htype = [x for x in ports if x in pypacker.Packet._handler[UDP.__name__]][0]
-			self._init_handler(htype, buf[8:])
-		except:
-			# no type found
-			# logger.debug("could not parse type: %d because: %s" % (type, e))
-			pass
+		sport, dport = unpack_ports(buf)
+
+		# source or destination port should match
+		if sport in udp_handler:
+			self._init_handler(sport, buf[8:])
+		elif dport in udp_handler:
+			self._init_handler(dport, buf[8:])
+		# no type found: leave raw bytes as body
 		return 8
 
 	def _calc_sum(self):
@@ -80,17 +74,22 @@ class UDP(pypacker.Packet):
 			# we need src/dst for checksum-calculation
 			src, dst = self._lower_layer.src, self._lower_layer.dst
 			# logger.debug(src + b" / "+ dst)
-			self.sum = 0
-			udp_bin = self.header_bytes + self.body_bytes
+			body_bytes = self.body_bytes
+			udp_len = 8 + len(body_bytes)
 
 			# IP-pseudoheader: IP src, dst, \x00, UDP upper proto, length
 			# check if version 4 or 6
 			if len(src) == 4:
-				s = pack(">4s4sBBH", src, dst, 0, 17, len(udp_bin))		# 17 = UDP
+				s = pack_pseudoheader_ip4(src, dst, 0, 17, udp_len)		# 17 = UDP
 			else:
-				s = pack(">16s16sxBH", src, dst, 17, len(udp_bin))		# 17 = UDP
+				s = pack_pseudoheader_ip6(src, dst, 17, udp_len)		# 17 = UDP
 
-			csum = checksum.in_cksum(s + udp_bin)
+			# sum up parts instead of concatenating them: pseudoheader is of even length,
+			# only the body can be of odd length (needs to be last).
+			# Header words are taken from the field values using checksum 0: this avoids
+			# re-packing the header twice (sum=0 and sum=csum).
+			csum = in_cksum_add(self.sport + self.dport + self.ulen, s)
+			csum = in_cksum_done(in_cksum_add(csum, body_bytes))
 
 			if csum == 0:
 				csum = 0xffff    # RFC 768, p2
@@ -139,3 +138,5 @@ pypacker.Packet.load_handler(UDP,
 		UDP_PROTO_SIP: sip.SIP
 	}
 )
+# avoid unneeded references for performance reasons: port -> handler class
+udp_handler = UDP._handler_map
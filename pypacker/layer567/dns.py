@@ -315,15 +315,15 @@ class DNS(pypacker.Packet):
 	def bin(self, update_auto_fields=True):
 		if update_auto_fields and self._header_changed:
 			# logger.debug("updating lenghts")
-			# avoid lazy dissect by checking for [b"bytes", dissect_callback]
+			# avoid lazy dissect by checking for TriggerListPending(b"bytes", dissect_callback)
 			# first assigning to length will trigger _unpack(...)
-			if self._queries.__class__ is not list:
+			if self._queries.__class__ is not pypacker.TriggerListPending:
 				self.questions_amount = len(self.queries)
-			if self._answers.__class__ is not list:
+			if self._answers.__class__ is not pypacker.TriggerListPending:
 				self.answers_amount = len(self.answers)
-			if self._auths.__class__ is not list:
+			if self._auths.__class__ is not pypacker.TriggerListPending:
 				self.authrr_amount = len(self.auths)
-			if self._addrecords.__class__ is not list:
+			if self._addrecords.__class__ is not pypacker.TriggerListPending:
 				self.addrr_amount = len(self.addrecords)
 			# logger.debug("finished updating lengths")
 		return pypacker.Packet.bin(self, update_auto_fields=update_auto_fields)
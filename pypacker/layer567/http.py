@@ -11,6 +11,8 @@ logger = logging.getLogger("pypacker")
 
 
 class HTTPHeader(triggerlist.TriggerList):
+	__slots__ = []
+
 	def _pack(self):
 		# logger.debug("packing HTTP-header")
 		# no header = no CRNL
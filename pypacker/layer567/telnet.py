@@ -28,6 +28,8 @@ SYNCH	= 242		# for telfunc calls
 
 
 class TelnetTriggerList(triggerlist.TriggerList):
+	__slots__ = []
+
 	def _pack(self):
 		return b"".join(self)
 
@@ -1,14 +1,15 @@
 """
 Simple packet creation and parsing logic.
 """
-import copy
+import functools
 import logging
 import random
 import re
+import socket
 import struct
 from struct import Struct
 
-from pypacker.pypacker_meta import MetaPacket
+from pypacker.pypacker_meta import MetaPacket, TriggerListPending
 
 logging.basicConfig(format="%(levelname)s (%(funcName)s): %(message)s")
 logger = logging.getLogger("pypacker")
@@ -16,8 +17,18 @@ logger.setLevel(logging.WARNING)
 # logger.setLevel(logging.INFO)
 # logger.setLevel(logging.DEBUG)
 
+# deprecated: not used anymore, kept for code importing it (use VISIBLE_CHARS_TABLE)
 PROG_VISIBLE_CHARS	= re.compile(b"[^\x20-\x7e]")
-HEADER_TYPES_SIMPLE	= set([int, bytes])
+# translate table replacing non-visible chars by "."
+VISIBLE_CHARS_TABLE	= bytes([x if 0x20 <= x <= 0x7e else 0x2e for x in range(256)])
+# two digit hex strings of all byte values
+HEX_STRINGS		= tuple(["%02x" % x for x in range(256)])
+HEX_STRINGS_UPPER	= tuple(["%02X" % x for x in range(256)])
+# compiled header formats keyed by format string: packets having the same
+# header shape (active fields, TriggerList lengths) share one Struct
+get_header_struct	= functools.lru_cache(maxsize=1024)(Struct)
+# value for _target_unpack_clz: never matches any class, so every upper layer gets unpacked
+TARGET_UNPACK_ALL	= object()
 
 DIR_SAME		= 1
 DIR_REV			= 2
@@ -190,19 +201,27 @@ class Packet(object, metaclass=MetaPacket):
 
 	def __len__(self):
 		"""Return total length (= header + all upper layer data) in bytes."""
+		length = self._len_cached
+
+		if length is not None:
+			return length
 
 		if self._body_bytes is not None:
 			# logger.debug("returning length from raw bytes in %s" % self.__class__.__name__)
-			return self.header_len + len(self._body_bytes)
+			length = self.header_len + len(self._body_bytes)
+		elif self._lazy_handler_data is not None:
+			# lazy data present: avoid unneeded parsing
+			# logger.debug("returning length from cached lazy handler in %s" % self.__class__.__name__)
+			length = self.header_len + len(self._lazy_handler_data[2])
 		else:
-			try:
-				# lazy data present: avoid unneeded parsing
-				# logger.debug("returning length from cached lazy handler in %s" % self.__class__.__name__)
-				return self.header_len + len(self._lazy_handler_data[2])
-			except TypeError:
-				# logger.debug("returning length from present handler in %s, handler is: %s"\
-				# % (self.__class__.__name__, self._bodytypename))
-				return self.header_len + len(self.__getattribute__(self._bodytypename))
+			# logger.debug("returning length from present handler in %s, handler is: %s"\
+			# % (self.__class__.__name__, self._bodytypename))
+			length = self.header_len + len(self.__getattribute__(self._bodytypename))
+
+		if self._unpacked is not None:
+			# dissect finished: length only changes via setters from now on
+			self._len_cached = length
+		return length
 
 	#
 	# public access to header length: keep it uptodate
@@ -251,6 +270,7 @@ class Packet(object, metaclass=MetaPacket):
 		self._body_bytes = value
 		self._body_changed = True
 		self._lazy_handler_data = None
+		self._reset_layer_caches()
 		self._notify_changelistener()
 
 	# return body data as raw bytes (deprecated)
@@ -296,7 +316,7 @@ class Packet(object, metaclass=MetaPacket):
 		else:
 			# set a new body handler
 			# associate ip, arp etc with handler-instance to call "ether.ip", "ip.tcp" etc
-			self._bodytypename = hndl.__class__.__name__.lower()
+			self._bodytypename = hndl._lower_name
 			self._body_bytes = None
 			# upper layer (self) to lower layer (hndl) eg TCP -access to-> IP
 			hndl._lower_layer = self
@@ -304,6 +324,10 @@ class Packet(object, metaclass=MetaPacket):
 			# logger.debug("finished setting handler: %s" % self._bodytypename)
 		self._body_changed = True
 		self._lazy_handler_data = None
+
+		if self._unpacked is not None:
+			# _unpacked is None while dissecting: nothing cached yet
+			self._reset_layer_caches()
 		self._notify_changelistener()
 
 	# get/set body handler or None. Note: this will force lazy dissecting when reading
@@ -322,13 +346,28 @@ class Packet(object, metaclass=MetaPacket):
 		return current
 
 	def _highest_layer(self):
-		current = self
+		current = self._highest_layer_cached
 
-		while current.body_handler is not None:
-			current = current.body_handler
+		if current is None:
+			current = self
+
+			while current.body_handler is not None:
+				current = current.body_handler
+			self._highest_layer_cached = current
 
 		return current
 
+	def _reset_layer_caches(self):
+		"""
+		Reset cached highest layer and total length of this and all lower layers.
+		"""
+		current = self
+
+		while current is not None:
+			current._highest_layer_cached = None
+			current._len_cached = None
+			current = current._lower_layer
+
 	# get lowest layer
 	lowest_layer = property(_lowest_layer)
 	# get top layer
@@ -339,42 +378,37 @@ class Packet(object, metaclass=MetaPacket):
 		Gets called if there are no fields matching the name 'varname'. Check if we got
 		lazy handler data set which must get initiated now.
 		"""
-		try:
-			# This should be the best way lazy initiating body handler as body handler names/types
-			# are not known a priori.
-			if self._lazy_handler_data[0] == varname:
-				# lazy handler data was set, parse lazy handler data now!
-				# logger.debug("lazy dissecting handler: %s" % varname)
-				handler_data = self._lazy_handler_data
-
-				try:
-					# instantiate handler class using lazy data buffer
-					# See _init_handler() for 2nd place where handler instantation takes place
-					# logger.debug("lazy parsing using: %r" % handler_data)
-					type_instance = handler_data[1](handler_data[2], self)
-
-					self._set_bodyhandler(type_instance)
-					self._lazy_handler_data = None
-					# this was a lazy init: same as direct dissecting -> no body change
-					self._body_changed = False
-
-					return type_instance
-				except:
-					# error on lazy dissecting: set raw bytes
-					# logger.debug("Exception on dissecting lazy handler")
-					logger.exception("could not lazy-parse handler: %r, there could be 2 reasons for this: " % handler_data +
-						"1) packet was malformed 2) dissecting-code is buggy")
-					self._bodytypename = None
-					self._body_bytes = handler_data[2]
-					self._lazy_handler_data = None
-
-					# TODO: remove this to ignore parse errors (set raw bytes after all)
-					# raise Exception("2>>>>>>>>>>> %r (lazy dissecting)" % e)
-					return None
-		# logger.debug("searching for dynamic field: %s/%r" % (varname,self._header_fields_dyn_dict))
-		except TypeError:
-			# logger.warning("unable to find: %s" % varname)
-			pass
+		handler_data = self._lazy_handler_data
+
+		# This should be the best way lazy initiating body handler as body handler names/types
+		# are not known a priori.
+		if handler_data is not None and handler_data[0] == varname:
+			# lazy handler data was set, parse lazy handler data now!
+			# logger.debug("lazy dissecting handler: %s" % varname)
+			try:
+				# instantiate handler class using lazy data buffer
+				# See _init_handler() for 2nd place where handler instantation takes place
+				# logger.debug("lazy parsing using: %r" % handler_data)
+				type_instance = handler_data[1](handler_data[2], self)
+
+				self._set_bodyhandler(type_instance)
+				self._lazy_handler_data = None
+				# this was a lazy init: same as direct dissecting -> no body change
+				self._body_changed = False
+
+				return type_instance
+			except:
+				# error on lazy dissecting: set raw bytes
+				# logger.debug("Exception on dissecting lazy handler")
+				logger.exception("could not lazy-parse handler: %r, there could be 2 reasons for this: " % handler_data +
+					"1) packet was malformed 2) dissecting-code is buggy")
+				self._bodytypename = None
+				self._body_bytes = handler_data[2]
+				self._lazy_handler_data = None
+
+				# TODO: remove this to ignore parse errors (set raw bytes after all)
+				# raise Exception("2>>>>>>>>>>> %r (lazy dissecting)" % e)
+				return None
 
 		# nope not found...
 		raise AttributeError("Can't find Attribute %s in %r, body type: %s" % (varname, self.__class__, self._bodytypename))
@@ -406,8 +440,7 @@ class Packet(object, metaclass=MetaPacket):
 		Iterate over every layer starting with this ending at last/highest one
 		"""
 		p_instance = self._get_bodyhandler()
-		# assume string class never gets found
-		self._target_unpack_clz = str.__class__
+		self._target_unpack_clz = TARGET_UNPACK_ALL
 
 		while p_instance is not None:
 			yield p_instance
@@ -465,19 +498,14 @@ class Packet(object, metaclass=MetaPacket):
 		packet_to_add -- the packet to be added as new highest layer for this packet
 		"""
 
-		# get highest layer from this packet
-		highest_layer = self
-		# unpack all layer, assuming string class will be never found
-		self._target_unpack_clz = str.__class__
+		# get highest layer from this packet: this will only dissect lazy data not yet dissected
+		self._highest_layer()._set_bodyhandler(packet_to_add)
 
-		while highest_layer is not None:
-			if highest_layer._bodytypename is not None:
-				# this will dissect any lazy data
-				highest_layer = highest_layer._get_bodyhandler()
-			else:
-				break
-
-		highest_layer._set_bodyhandler(packet_to_add)
+		if packet_to_add._bodytypename is None:
+			# new highest layer is known: A + B + C... won't search it again
+			self._highest_layer_cached = packet_to_add
+		else:
+			self._highest_layer_cached = packet_to_add._highest_layer_cached
 
 		return self
 
@@ -485,26 +513,31 @@ class Packet(object, metaclass=MetaPacket):
 		"""
 		verbose -- If False just include this layer, otherweise include all up to highest layer
 		"""
-		# recalculate fields like checksums, lengths etc
-		if self._header_changed or self._body_changed:
-			# logger.debug("header/body changed: need to reparse")
-			self.bin()
-		if not self._unpacked:
-			self._unpack()
+		layer_sums = []
+		current = self
 
-		# create key=value descriptions
-		# show all header even deactivated ones
-		l = ["%s=%r" % (name[1:], getattr(self, name[1:])) for name in self._header_field_names]
-		if self._bodytypename is None:
-			# no bodyhandler present
-			l.append("bytes=%r" % self.body_bytes)
-		else:
-			# assume bodyhandler is set
-			l.append("handler=%s" % self._bodytypename)
-		layer_sums = ["%s(%s)" % (self.__class__.__name__, ", ".join(l))]
+		while current is not None:
+			# recalculate fields like checksums, lengths etc
+			if current._header_changed or current._body_changed:
+				# logger.debug("header/body changed: need to reparse")
+				current.bin()
+			if not current._unpacked:
+				current._unpack()
+
+			# create key=value descriptions
+			# show all header even deactivated ones
+			l = ["%s=%r" % (name, getattr(current, name)) for name in current._header_field_names_public]
+			if current._bodytypename is None:
+				# no bodyhandler present
+				l.append("bytes=%r" % current.body_bytes)
+			else:
+				# assume bodyhandler is set
+				l.append("handler=%s" % current._bodytypename)
+			layer_sums.append("%s(%s)" % (current.__class__.__name__, ", ".join(l)))
 
-		if verbose and self._bodytypename is not None:
-			layer_sums.append("%r" % self._get_bodyhandler())
+			if not verbose or current._bodytypename is None:
+				break
+			current = current._get_bodyhandler()
 
 		return "\n".join(layer_sums)
 
@@ -546,21 +579,26 @@ class Packet(object, metaclass=MetaPacket):
 
 		# logger.debug([self_getattr(name) for name in self._header_field_names])
 		try:
-			header_unpacked = self._header_format.unpack(self._header_cached)
+			header_unpacked = self._header_unpack(self._header_cached)
 		except struct.error:
 			raise Exception("could not unpack in: %s, format: %r, names: %r, value to unpack: %s" %
 				(self.__class__.__name__, self._header_format.format,
 				self._header_field_names, self._header_cached))
 		# logger.debug("unpacking via format: %r -> %r" % (self._header_format.format, header_unpacked))
+
+		if self._header_fields_static is not None and self._header_format is self.__class__._header_format:
+			# format unchanged: every field is active and got a value
+			self.__dict__.update(zip(self._header_fields_static, header_unpacked))
+			return
 		cnt = 0
 		"""
 		logger.debug("unpacking 2: %r, %r -> %r,\n%r,\n %r\n" % (self.__class__, header_unpacked, self._header_field_names,
 			[self_getattr(name + "_format") for name in self._header_field_names],
 			[self_getattr(name + "_active") for name in self._header_field_names]))
 		"""
-		for name in self._header_field_names:
+		for name, name_format, name_active, _ in self._header_field_infos:
 			# only set values if active simple field
-			if self_getattr(name + "_format") is not None and self_getattr(name + "_active"):
+			if self_getattr(name_format) is not None and self_getattr(name_active):
 				# logger.debug("unpacking value: %s -> %s" % (name_bytes[0], name_bytes[1]))
 				self_setattr(name, header_unpacked[cnt])
 				cnt += 1
@@ -599,11 +637,19 @@ class Packet(object, metaclass=MetaPacket):
 			# logger.debug("empty buffer given for _init_handler()!")
 			return
 
+		clz = self._handler_map.get(hndl_type, None)
+
+		if clz is None:
+			logger.info("unknown type for %s: %d, feel free to implement" % (self.__class__, hndl_type))
+			self.body_bytes = buffer
+			# TODO: comment in
+			# raise Exception("1a>>>>>>>>>>> (key unknown)")
+			return
+
 		try:
 			if self._target_unpack_clz is None or self._target_unpack_clz is self.__class__:
 				# set lazy handler data, __getattr__() will be called on access to handler (field not yet initiated)
-				clz = Packet._handler[self.__class__.__name__][hndl_type]
-				clz_name = clz.__name__.lower()
+				clz_name = clz._lower_name
 				# logger.debug("setting handler name: %s -> %s" % (self.__class__.__name__, clz_name))
 				self._lazy_handler_data = [clz_name, clz, buffer]
 				# set name although we don't set a handler (needed for direction() et al)
@@ -615,13 +661,8 @@ class Packet(object, metaclass=MetaPacket):
 				# continue parsing layers, happens on "__getitem__()": avoid unneeded lazy-data handling
 				# if specific class must be found
 				# logger.debug("--------> direct unpacking in: %s" % (self.__class__.__name__))
-				type_instance = Packet._handler[self.__class__.__name__][hndl_type](buffer, self)
+				type_instance = clz(buffer, self)
 				self._set_bodyhandler(type_instance)
-		except KeyError:
-			logger.info("unknown type for %s: %d, feel free to implement" % (self.__class__, hndl_type))
-			self.body_bytes = buffer
-			# TODO: comment in
-			# raise Exception("1a>>>>>>>>>>> (key unknown)")
 		except Exception:
 			logger.exception("can't set handler data, type/lazy: %s/%s:" %
 				(str(hndl_type), self._target_unpack_clz is None or self._target_unpack_clz is self.__class__))
@@ -638,7 +679,7 @@ class Packet(object, metaclass=MetaPacket):
 		bts -- bts to be dissected
 		dissect_callback -- callback to be used to dissect, signature: callback(bytes) -> returns list of bytes, packets, ...
 		"""
-		self.__setattr__("_%s" % name, [bts, dissect_callback])
+		self.__setattr__("_%s" % name, TriggerListPending(bts, dissect_callback))
 		self._header_format_changed = True
 
 	def direction_all(self, other_packet):
@@ -720,28 +761,30 @@ class Packet(object, metaclass=MetaPacket):
 		"""
 		Update format of non-static fields and update _header_format
 		"""
-		header_format = [self._header_format_order]
+		header_format = [self._header_format_prefix]
 		self_getattr = self.__getattribute__
 
-		for name in self._header_field_names:
-			if not self_getattr(name + "_active"):
+		for name, name_format, name_active, is_triggerlist in self._header_field_infos_dyn:
+			if not self_getattr(name_active):
 				continue
 
-			val = self.__getattribute__(name)
-
-			if val.__class__ in HEADER_TYPES_SIMPLE:		# assume bytes/int/float
-				header_format.append(self_getattr(name + "_format"))
+			if not is_triggerlist:
+				header_format.append(self_getattr(name_format))
 				# logger.debug("adding format for (simple): %r, %s, val: %s" % (self.__class__, name, self_getattr(name)))
-			else:							# assume TriggerList
-				if val.__class__ == list:
+			else:
+				val = self_getattr(name)
+
+				if val.__class__ is TriggerListPending:
 					# TriggerList not yet initiated: take cached value
-					header_format.append("%ds" % len(val[0]))
-					# logger.debug("adding format for: %r, %s, val: %s" % (self.__class__, name, val[0]))
+					header_format.append("%ds" % len(val.bts))
+					# logger.debug("adding format for: %r, %s, val: %s" % (self.__class__, name, val.bts))
 				else:
 					header_format.append("%ds" % len(val.bin()))
 					# logger.debug("adding format for: %r, %s, val: %s" % (self.__class__, name, val.bin()))
-		self._header_format = Struct("".join(header_format))
-		self._header_len = self._header_format.size
+		header_struct = self._header_format = get_header_struct("".join(header_format))
+		self._header_unpack = header_struct.unpack
+		self._header_pack = header_struct.pack
+		self._header_len = header_struct.size
 		self._header_format_changed = False
 
 	def _pack_header(self):
@@ -763,28 +806,32 @@ class Packet(object, metaclass=MetaPacket):
 			# real format needed for correct packing
 			self._update_header_format()
 
-		header_values = []
-		self_getattr = self.__getattribute__
-
-		for name in self._header_field_names:
-			if not self_getattr(name + "_active"):
-				continue
-			val = self_getattr(name)
-			# two options:
-			# - simple type (int, bytes, ...)	-> add given value
-			# - TriggerList	(found via format None) -> call bin()
-			if val.__class__ in HEADER_TYPES_SIMPLE:		# assume bytes/int/float
-				header_values.append(val)
-			else:					# assume TriggerList
-				if val.__class__ == list:
-					header_values.append(val[0])
+		if self._header_fields_static is not None and self._header_format is self.__class__._header_format:
+			# format unchanged: every field is active and got a value
+			header_values = self._header_values_static(self)
+		else:
+			header_values = []
+			self_getattr = self.__getattribute__
+
+			for name, _, name_active, is_triggerlist in self._header_field_infos:
+				if not self_getattr(name_active):
+					continue
+				val = self_getattr(name)
+				# two options:
+				# - simple type (int, bytes, ...)	-> add given value
+				# - TriggerList -> call bin()
+				if not is_triggerlist:
+					header_values.append(val)
 				else:
-					header_values.append(val.bin())
+					if val.__class__ is TriggerListPending:
+						header_values.append(val.bts)
+					else:
+						header_values.append(val.bin())
 
 		# logger.debug("header bytes for %s: %s = %s" % (self.__class__.__name__, self._header_format.format, header_bytes))
 		# info: individual unpacking is about 4 times slower than cumulative
 		try:
-			self._header_cached = self._header_format.pack(*header_values)
+			self._header_cached = self._header_pack(*header_values)
 		except Exception as e:
 			logger.warning("Could not pack header data. Did some header value exceed specified format?"
 						" (e.g. 500 -> 'B'): %r" % e)
@@ -803,20 +850,17 @@ class Packet(object, metaclass=MetaPacket):
 
 		return -- True if header or body changed, else False
 		"""
-		changed = False
 		p_instance = self
 
-		while p_instance is not None:
+		while True:
 			if p_instance._header_changed or p_instance._body_changed:
-				changed = True
-				break
-			elif p_instance._lazy_handler_data is None:
-				# one layer up, stop if next layer is not yet initiated which means: no change
-				p_instance = p_instance._get_bodyhandler()
-			else:
+				return True
+			elif p_instance._lazy_handler_data is not None or p_instance._bodytypename is None:
 				# nothing changed upwards: lazy handler data still present/nothing got parsed
-				break
-		return changed
+				# or highest layer reached
+				return False
+			# one layer up, handler is already parsed
+			p_instance = p_instance.__getattribute__(p_instance._bodytypename)
 
 	def _reset_changed(self):
 		"""Set the header/body changed-flag to False. This won't clear caches."""
@@ -853,6 +897,10 @@ class Packet(object, metaclass=MetaPacket):
 		This is primarily meant for triggerlist to react
 		on changes in packets like Triggerlist[packet1, packet2, ...].
 		"""
+		if not self._changelistener:
+			# nobody listening: the common case
+			return
+
 		for listener_cb in self._changelistener:
 			try:
 				listener_cb()
@@ -871,11 +919,14 @@ class Packet(object, metaclass=MetaPacket):
 
 		if clz_name in Packet._handler:
 			logger.debug("handler already loaded: %r" % clz_name)
+			clz_add._handler_map = Packet._handler[clz_name]
 			return
 
 		# logger.debug("adding classes as handler: [%r] = %r" % (clz_add, handler))
 
 		Packet._handler[clz_name] = {}
+		# bind to class: avoids looking up the class name on every dissect
+		clz_add._handler_map = Packet._handler[clz_name]
 
 		for handler_id, packetclass in handler.items():
 			# pypacker.Packet.load_handler(IP, { ID : class } )
@@ -901,12 +952,12 @@ class Packet(object, metaclass=MetaPacket):
 		else:
 			buf = self.bin()
 		buflen = len(buf)
+		get_hex = HEX_STRINGS.__getitem__
 
 		while bytepos < buflen:
 			line = buf[bytepos: bytepos + length]
-			hexa = " ".join(["%02x" % x for x in line])
-			# line = line.translate(__vis_filter)
-			line = re.sub(PROG_VISIBLE_CHARS, b".", line)
+			hexa = " ".join(map(get_hex, line))
+			line = line.translate(VISIBLE_CHARS_TABLE)
 			res.append("  %04d:      %-*s %s" % (bytepos, length * 3, hexa, line))
 			bytepos += length
 		return "\n".join(res)
@@ -915,35 +966,48 @@ class Packet(object, metaclass=MetaPacket):
 # utility functions
 # These could be put into separate modules but this would lead to recursive import problems.
 #
+# Conversions of addresses/names are cached (process wide): the same values appear over and over again.
+# The cache needs hashable values: bytes-like values (bytearray, memoryview) are converted to bytes first.
+#
 # avoid unneeded references for performance reasons
 pack_ipv4 = Struct("BBBB").pack
 unpack_ipv4 = Struct("BBBB").unpack
 pack_mac = Struct("BBBBBB").pack
 unpack_mac = Struct("BBBBBB").unpack
-randint = random.randint
+getrandbits = random.getrandbits
+inet_pton = socket.inet_pton
+inet_ntoa = socket.inet_ntoa
+AF_INET = socket.AF_INET
+bytes_fromhex = bytes.fromhex
 
 
 def byte2hex(buf):
 	"""Convert a bytestring to a hex-represenation:
 	b'1234' -> '\x31\x32\x33\x34'"""
-	return "\\x" + "\\x".join(["%02X" % x for x in buf])
+	return "\\x" + "\\x".join(map(HEX_STRINGS_UPPER.__getitem__, buf))
 
 
 # MAC address
+@functools.lru_cache(maxsize=1024)
 def mac_str_to_bytes(mac_str):
 	"""Convert mac address AA:BB:CC:DD:EE:FF to byte representation."""
-	return b"".join([bytes.fromhex(x) for x in mac_str.split(":")])
+	return bytes_fromhex(mac_str.replace(":", ""))
+
+
+@functools.lru_cache(maxsize=1024)
+def _mac_bytes_to_str(mac_bytes):
+	return "%02X:%02X:%02X:%02X:%02X:%02X" % unpack_mac(mac_bytes)
 
 
 def mac_bytes_to_str(mac_bytes):
 	"""Convert mac address from byte representation to AA:BB:CC:DD:EE:FF."""
-	return "%02X:%02X:%02X:%02X:%02X:%02X" % unpack_mac(mac_bytes)
+	return _mac_bytes_to_str(mac_bytes if mac_bytes.__class__ is bytes else bytes(mac_bytes))
 
 
 def get_rnd_mac():
 	"""Create random mac address as bytestring"""
-	return pack_mac(randint(0, 255), randint(0, 255), randint(0, 255),
-		randint(0, 255), randint(0, 255), randint(0, 255))
+	# one call to the (seedable) generator instead of one per byte
+	return getrandbits(48).to_bytes(6, "big")
 
 
 def get_property_mac(varname):
@@ -956,20 +1020,36 @@ def get_property_mac(varname):
 
 
 # IPv4 address
+@functools.lru_cache(maxsize=1024)
 def ip4_str_to_bytes(ip_str):
 	"""Convert ip address 127.0.0.1 to byte representation."""
-	ips = [int(x) for x in ip_str.split(".")]
-	return pack_ipv4(ips[0], ips[1], ips[2], ips[3])
+	# inet_aton() would accept eg "127.1" or trailing garbage
+	try:
+		return inet_pton(AF_INET, ip_str)
+	except OSError:
+		# not in strict notation (eg "127.000.000.001"): parse number by number
+		pass
+
+	try:
+		ips = [int(x) for x in ip_str.split(".")]
+		return pack_ipv4(ips[0], ips[1], ips[2], ips[3])
+	except (IndexError, struct.error):
+		raise ValueError("invalid ip address: %r" % ip_str)
+
+
+@functools.lru_cache(maxsize=1024)
+def _ip4_bytes_to_str(ip_bytes):
+	return inet_ntoa(ip_bytes)
 
 
 def ip4_bytes_to_str(ip_bytes):
 	"""Convert ip address from byte representation to 127.0.0.1."""
-	return "%d.%d.%d.%d" % unpack_ipv4(ip_bytes)
+	return _ip4_bytes_to_str(ip_bytes if ip_bytes.__class__ is bytes else bytes(ip_bytes))
 
 
 def get_rnd_ipv4():
 	"""Create random ipv4 adress as bytestring"""
-	return pack_ipv4(randint(0, 255), randint(0, 255), randint(0, 255), randint(0, 255))
+	return getrandbits(32).to_bytes(4, "big")
 
 
 def get_property_ip4(var):
@@ -981,6 +1061,21 @@ def get_property_ip4(var):
 
 
 # DNS names
+@functools.lru_cache(maxsize=1024)
+def _dns_name_decode(name):
+	# [b"www", b"example", b"com"]
+	labels = []
+	off = 1
+	name_len = len(name)
+
+	while off < name_len:
+		end = off + name[off - 1]
+		labels.append(name[off: end])
+		off = end + 1
+	# decode once for all labels
+	return b".".join(labels).decode() + "."
+
+
 def dns_name_decode(name):
 	"""
 	DNS domain name decoder (bytes to string)
@@ -988,17 +1083,10 @@ def dns_name_decode(name):
 	name -- example: b"\x03www\x07example\x03com\x00"
 	return -- example: "www.example.com."
 	"""
-	# ["www", "example", "com"]
-	name_decoded = []
-	off = 1
-
-	while off < len(name):
-		# b"xxx" -> "xxx"
-		name_decoded.append(name[off: off + name[off - 1]].decode())
-		off += name[off - 1] + 1
-	return ".".join(name_decoded) + "."
+	return _dns_name_decode(name if name.__class__ is bytes else bytes(name))
 
 
+@functools.lru_cache(maxsize=1024)
 def dns_name_encode(name):
 	"""
 	DNS domain name encoder (string to bytes)
@@ -1006,14 +1094,16 @@ def dns_name_encode(name):
 	name -- example: "www.example.com"
 	return -- example: b'\x03www\x07example\x03com\x00'
 	"""
-	name_encoded = [b""]
-	# "www" -> b"www"
-	labels = [part.encode() for part in name.split(".") if len(part) != 0]
-
-	for label in labels:
-		# b"www" -> "\x03www"
-		name_encoded.append(chr(len(label)).encode() + label)
-	return b"".join(name_encoded) + b"\x00"
+	name_encoded = bytearray()
+
+	# encode once for all labels: "www.example.com" -> [b"www", b"example", b"com"]
+	for label in name.encode().split(b"."):
+		if len(label) != 0:
+			# b"www" -> b"\x03www"
+			name_encoded.append(len(label))
+			name_encoded += label
+	name_encoded.append(0)
+	return bytes(name_encoded)
 
 
 def get_property_dnsname(var):
@@ -1,9 +1,26 @@
+import operator
 import struct
+import sys
 import logging
 
 logger = logging.getLogger("pypacker")
 
 
+class TriggerListPending(object):
+	"""
+	Value of a TriggerList field not yet initiated: raw bytes and callback to dissect them.
+	"""
+	__slots__ = ["bts", "dissect_callback"]
+
+	def __init__(self, bts, dissect_callback):
+		self.bts = bts
+		self.dissect_callback = dissect_callback
+
+
+# initial value of all TriggerList fields (shared: never changed, only replaced)
+TRIGGERLIST_PENDING_EMPTY = TriggerListPending(b"", None)
+
+
 class MetaPacket(type):
 	"""
 	This Metaclass is a more efficient way of setting attributes than using __init__.
@@ -40,20 +57,33 @@ class MetaPacket(type):
 				if obj._unpacked is not None and not obj._unpacked:
 					# obj._unpacked = None means: dissect not yet finished
 					obj._unpack()
+				format_changed = False
+
 				if value is None and obj.__getattribute__(varname_shadowed + "_active"):
 					object.__setattr__(obj, varname_shadowed + "_active", False)
-					obj._header_format_changed = True
+					format_changed = True
 					# logger.debug("deactivating field: %s" % varname_shadowed)
 				elif value is not None and not obj.__getattribute__(varname_shadowed + "_active"):
 					object.__setattr__(obj, varname_shadowed + "_active", True)
-					obj._header_format_changed = True
+					format_changed = True
 					# logger.debug("activating field: %s" % varname_shadowed)
+
+				if format_changed:
+					# static format prefix could now contain inactive fields: build format from all fields
+					obj._header_format_prefix = obj._header_format_order
+					obj._header_field_infos_dyn = obj._header_field_infos
+
 				if not is_field_static and value is not None:
 					# simple dynamic field
 					format_new = "%ds" % len(value)
 					# logger.debug(">>> changing format for dynamic field: %r / %s / %s" % (obj.__class__, varname_shadowed, format_new))
 					object.__setattr__(obj, varname_shadowed + "_format", format_new)
+					format_changed = True
+
+				if format_changed:
 					obj._header_format_changed = True
+					# header length could have changed
+					obj._reset_layer_caches()
 
 				object.__setattr__(obj, varname_shadowed, value)
 				obj._header_changed = True
@@ -67,12 +97,12 @@ class MetaPacket(type):
 				"""
 				tl = obj.__getattribute__(varname_shadowed)
 
-				if type(tl) is list:
+				if type(tl) is TriggerListPending:
 					# we need to create the original TriggerList in order to unpack correctly
-					# _triggerlistName = [b"bytes", callback] or
-					# _triggerlistName = [b"", callback] (default initiation)
+					# _triggerlistName = TriggerListPending(b"bytes", callback) or
+					# _triggerlistName = TriggerListPending(b"", None) (default initiation)
 					# logger.debug(">>> initiating TriggerList")
-					tl = obj._header_fields_dyn_dict[varname_shadowed](obj, dissect_callback=tl[1], buffer=tl[0])
+					tl = obj._header_fields_dyn_dict[varname_shadowed](obj, dissect_callback=tl.dissect_callback, buffer=tl.bts)
 					object.__setattr__(obj, varname_shadowed, tl)
 				# this will trigger unpacking
 
@@ -84,6 +114,7 @@ class MetaPacket(type):
 				else:
 					tl.append(value)
 				obj._header_changed = True
+				obj._reset_layer_caches()
 				obj._notify_changelistener()
 
 			if is_field_type_simple:
@@ -98,6 +129,8 @@ class MetaPacket(type):
 			return -- get-property for simple type or triggerlist
 			"""
 			varname_shadowed = "_%s" % varname
+			# C-level lookup: avoids creating a bound __getattribute__ on every access
+			get_shadowed = operator.attrgetter(varname_shadowed)
 
 			def getfield_simple(obj):
 				"""
@@ -107,16 +140,16 @@ class MetaPacket(type):
 				if obj._unpacked is not None and not obj._unpacked:
 					obj._unpack()
 				# logger.debug("now returning value")
-				return obj.__getattribute__(varname_shadowed)
+				return get_shadowed(obj)
 
 			def getfield_triggerlist(obj):
-				tl = obj.__getattribute__(varname_shadowed)
+				tl = get_shadowed(obj)
 				# logger.debug(">>> getting Triggerlist for %r: %r" % (obj.__class__, tl))
 
-				if type(tl) is list:
-					# _triggerlistName = [b"bytes", callback] or
-					# _triggerlistName = [b"", callback] (default initiation)
-					tl = obj._header_fields_dyn_dict[varname_shadowed](obj, dissect_callback=tl[1], buffer=tl[0])
+				if type(tl) is TriggerListPending:
+					# _triggerlistName = TriggerListPending(b"bytes", callback) or
+					# _triggerlistName = TriggerListPending(b"", None) (default initiation)
+					tl = obj._header_fields_dyn_dict[varname_shadowed](obj, dissect_callback=tl.dissect_callback, buffer=tl.bts)
 					object.__setattr__(obj, varname_shadowed, tl)
 
 				return tl
@@ -127,6 +160,8 @@ class MetaPacket(type):
 				return getfield_triggerlist
 
 		t = type.__new__(cls, clsname, clsbases, clsdict)
+		# lowercase class name: name of this class when set as body handler like ethernet.ip
+		t._lower_name = sys.intern(clsname.lower())
 		# dictionary of TriggerLists: name -> TriggerListClass
 		t._header_fields_dyn_dict = {}
 		# get header-infos from subclass: [("name", "format", value), ...]
@@ -146,8 +181,8 @@ class MetaPacket(type):
 			# logger.debug("loading meta for: %s, st: %s" % (clsname, st))
 			for hdr in hdrs:
 				shadowed_name = "_%s" % hdr[0]
+				shadowed_name_format = shadowed_name + "_format"
 				t._header_field_names.append(shadowed_name)
-				setattr(t, shadowed_name + "_active", True)
 
 				# remember header format
 				# t._header_field_infos[shadowed_name] = [True, hdr[1]]
@@ -165,7 +200,9 @@ class MetaPacket(type):
 						# assume simple dynamic field
 						is_field_static = False
 
-				setattr(t, shadowed_name + "_format", hdr[1])
+				setattr(t, shadowed_name_format, hdr[1])
+				# only simple fields can get deactivated
+				setattr(t, shadowed_name + "_active", not is_field_type_simple or hdr[2] is not None)
 
 				if is_field_type_simple:
 					fmt = hdr[1]
@@ -175,7 +212,7 @@ class MetaPacket(type):
 						if fmt is None:
 							# dynamic field
 							fmt = "%ds" % len(hdr[2])
-							setattr(t, shadowed_name + "_format", fmt)
+							setattr(t, shadowed_name_format, fmt)
 						header_fmt.append(fmt)
 						t._header_cached.append(hdr[2])
 						"""
@@ -184,11 +221,6 @@ class MetaPacket(type):
 							t._header_cached.append(hdr[2])
 						"""
 						# logger.debug("--------> field is active: %r" % hdr[0])
-					else:
-						setattr(t, shadowed_name + "_active", False)
-
-					# only simple fields can get deactivated
-					setattr(t, shadowed_name + "_active", True if hdr[2] is not None else False)
 
 					# set initial value via shadowed variable: _varname <- varname [optional in subclass: <- varname_s]
 					# setting/getting value is done via properties.
@@ -204,7 +236,7 @@ class MetaPacket(type):
 					# Triggerlists don't have initial default values (and can't get deactivated) TODO?
 					t._header_fields_dyn_dict[shadowed_name] = hdr[2]
 					# initial value of TiggerLists is: values to init empty list
-					setattr(t, shadowed_name, [b"", None])
+					setattr(t, shadowed_name, TRIGGERLIST_PENDING_EMPTY)
 					setattr(t, hdr[0], property(
 							get_getter(hdr[0], is_field_type_simple=False),
 							get_setter(hdr[0], is_field_type_simple=False, is_field_static=is_field_static)
@@ -215,6 +247,31 @@ class MetaPacket(type):
 					t._header_cached.append(b"")
 			# logger.debug("<<<<")
 
+		# header names as given in __hdr__ (without leading underscore)
+		t._header_field_names_public = tuple([name[1:] for name in t._header_field_names])
+		# (name, name_format, name_active, is_triggerlist) for every header: avoids building attribute
+		# names and checking value types on every (un)pack
+		t._header_field_infos = tuple([(name, sys.intern(name + "_format"), sys.intern(name + "_active"),
+			name in t._header_fields_dyn_dict) for name in t._header_field_names])
+		# format of leading static, initially active simple fields and infos of all other fields:
+		# only formats of the latter have to be re-evaluated by Packet._update_header_format()
+		prefix_len = 0
+
+		for hdr in (hdrs if hdrs is not None else []):
+			if hdr[1] is None or hdr[2] is None:
+				break
+			prefix_len += 1
+
+		t._header_format_prefix = "".join(header_fmt[:prefix_len + 1])
+		t._header_field_infos_dyn = t._header_field_infos[prefix_len:]
+		# header only consisting of static, initially active simple fields: values can directly be
+		# (un)packed as long as the format is unchanged, see Packet._unpack() and Packet._pack_header()
+		if hdrs is not None and len(hdrs) > 1 and all(hdr[1] is not None and hdr[2] is not None for hdr in hdrs):
+			t._header_fields_static = tuple(t._header_field_names)
+			t._header_values_static = operator.attrgetter(*t._header_field_names)
+		else:
+			t._header_fields_static = None
+			t._header_values_static = None
 		# logger.debug(">>> translated header names: %s/%r" % (clsname, t._header_name_translate))
 		# current format as string
 		t._header_format = struct.Struct("".join(header_fmt))
@@ -222,6 +279,9 @@ class MetaPacket(type):
 		t._header_len = t._header_format.size
 		# track changes to header format (changes to simple dynamic fields or TriggerList)
 		t._header_format_changed = False
+		# bound methods of _header_format: avoids attribute lookups on every (un)pack
+		t._header_unpack = t._header_format.unpack
+		t._header_pack = t._header_format.pack
 		# cached header, return this if nothing changed
 		t._header_cached = t._header_format.pack(*t._header_cached)
 		# logger.debug("formatstring is: %s" % header_fmt)
@@ -238,8 +298,14 @@ class MetaPacket(type):
 		# track changes to body value like [None | bytes | body-handler] -> [None | bytes | body-handler]
 		t._body_changed = False
 		# objects which get notified on changes on header or body (shared)
-		# TODO: use sets here
+		# No set: listeners are bound methods of TriggerLists which are unhashable before Python 3.8
 		t._changelistener = []
+		# body handler of this class: { id : handler_class }, set by Packet.load_handler()
+		t._handler_map = {}
+		# highest layer seen from this layer, reset on changes to body handlers of this and upper layers
+		t._highest_layer_cached = None
+		# total length (header + all upper layers), reset on changes to length of this and upper layers
+		t._len_cached = None
 		# lazy handler data: [name, class, bytes]
 		t._lazy_handler_data = None
 		# indicates the most top layer until which should be unpacked (vs. lazy dissecting = just next upper layer)
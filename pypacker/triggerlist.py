@@ -2,6 +2,8 @@
 
 import logging
 
+from pypacker.pypacker import Packet
+
 logger = logging.getLogger("pypacker")
 
 
@@ -11,6 +13,9 @@ class TriggerList(list):
 	This list can contain one type of raw bytes, tuples or packets representing an individual
 	header field. Using bytes or tuples "_pack()" can be overwritten to reassemble bytes.
 	"""
+	# Subclasses should define __slots__ = [] to avoid a per instance __dict__
+	__slots__ = ["_packet", "_dissect_callback", "_cached_result", "_lazy_dissect_done"]
+
 	def __init__(self, packet, dissect_callback=None, buffer=b""):
 		"""
 		packet -- packet where this TriggerList gets ingegrated
@@ -22,8 +27,13 @@ class TriggerList(list):
 		self._packet = packet
 		self._dissect_callback = dissect_callback
 		self._cached_result = buffer
+		# True if neither this list nor its Packet need any further dissecting
+		self._lazy_dissect_done = False
 
 	def _lazy_dissect(self):
+		if self._lazy_dissect_done:
+			return
+
 		if not self._packet._unpacked and self._packet._unpacked is not None:
 			# Before changing TriggerList we need to unpack or
 			# cached header won't fit on _unpack(...)
@@ -31,13 +41,13 @@ class TriggerList(list):
 			# Ignore if TriggerList changed in _dissect (_unpacked is None)
 			self._packet._unpack()
 
-		if self._dissect_callback is None:
-			# already dissected, ignore
-			return
-
-		initial_list_content = self._dissect_callback(self._cached_result)
-		self._dissect_callback = None
-		super().extend(initial_list_content)
+		if self._dissect_callback is not None:
+			initial_list_content = self._dissect_callback(self._cached_result)
+			self._dissect_callback = None
+			super().extend(initial_list_content)
+		# Packets can't go back to a packed state: done if Packet is unpacked
+		# (_unpacked is None while still in _dissect())
+		self._lazy_dissect_done = self._packet._unpacked is True
 
 	# Python predefined overwritten methods
 
@@ -105,16 +115,12 @@ class TriggerList(list):
 		val -- list of bytes, tuples or packets
 		add_listener -- re-add listener if True
 		"""
-		try:
-			for v in val:
-				# react on changes of packets in this triggerlist
+		for v in val:
+			# react on changes of packets in this triggerlist, bytes or tuples have no listeners
+			if isinstance(v, Packet):
 				v._remove_change_listener(None, remove_all=True)
 				if add_listener:
 					v._add_change_listener(self._notify_change)
-		except AttributeError as e:
-			# this will fail if val is not a packet
-			# logger.debug(e)
-			pass
 
 		self._notify_change()
 		# logger.debug("handle mod sub: finished")
@@ -128,6 +134,7 @@ class TriggerList(list):
 		try:
 			self._packet._header_changed = True
 			self._packet._header_format_changed = True
+			self._packet._reset_layer_caches()
 			# logger.debug(">>> TriggerList changed!!!")
 		except AttributeError as e:
 			# this only works on Packets
@@ -145,14 +152,8 @@ class TriggerList(list):
 		Custom implementations can be set by overwriting _pack().
 		"""
 		if self._cached_result is None:
-			try:
-				# logger.debug("calling pack")
-				self._cached_result = self._pack()
-			except:
-				# logger.debug(self)
-				# logger.debug("packing packets")
-				# logger.debug([pkt.bin() for pkt in self])
-				self._cached_result = b"".join([pkt.bin() for pkt in self])
+			# logger.debug("calling pack")
+			self._cached_result = self._pack()
 		# logger.debug("new cached result: %s" % self._cached_result)
 		return self._cached_result
 
@@ -187,12 +188,14 @@ class TriggerList(list):
 		except TypeError:
 			return None
 
-	"""
 	def _pack(self):
-		# This ca  be overwritten to create TriggerLists containing non-Packet values (see layer567/http.py)
-		# return -- byte string representation of this triggerlist
-		return b"".join(self)
-	"""
+		"""
+		This can be overwritten to create TriggerLists containing non-Packet values (see layer567/http.py)
+		Default: concatenate the bytes of all Packets in this list.
+
+		return -- byte string representation of this triggerlist
+		"""
+		return b"".join([pkt.bin() for pkt in self])
 
 	def __repr__(self):
 		self._lazy_dissect()
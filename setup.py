@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 
-from distutils.core import setup
+from setuptools import setup
 
 setup(name="pypacker",
 	version="3.1",
@@ -15,5 +15,7 @@ setup(name="pypacker",
 		"pypacker.layer3",
 		"pypacker.layer4",
 		"pypacker.layer567"
-	]
+	],
+	python_requires=">=3",
+	zip_safe=False
 )
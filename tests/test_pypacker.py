@@ -176,6 +176,11 @@ class GeneralTestCase(unittest.TestCase):
 		eth = ethernet.Ethernet(bts)
 		highest_layer = eth.highest_layer
 		self.assertEqual(highest_layer.__class__.__name__, "TCP")
+		# changes to upper layers must be reflected
+		eth.ip.body_bytes = b"abc"
+		self.assertEqual(eth.highest_layer.__class__.__name__, "IP")
+		eth.ip.body_handler = tcp.TCP()
+		self.assertEqual(eth.highest_layer.__class__.__name__, "TCP")
 
 	def test_len(self):
 		print_header("Length")
@@ -186,6 +191,17 @@ class GeneralTestCase(unittest.TestCase):
 			print("%d = %d" % (len(bts), len(eth)))
 			self.assertEqual(len(bts), len(eth))
 
+		# length must follow changes of upper layers
+		eth = ethernet.Ethernet(bts_list[0])
+		len_eth = len(eth)
+		tcp1 = eth[tcp.TCP]
+		self.assertEqual(len(eth), len_eth)
+		tcp1.body_bytes = tcp1.body_bytes + b"\x00" * 4
+		self.assertEqual(len(eth), len_eth + 4)
+		tcp1.opts.append(tcp.TCPOptSingle(type=tcp.TCP_OPT_NOP))
+		self.assertEqual(len(eth), len_eth + 5)
+		self.assertEqual(len(eth), len(eth.bin()))
+
 	def test_repr(self):
 		# TODO: activate
 		print_header("__repr__")
@@ -583,6 +599,13 @@ class IP6TestCase(unittest.TestCase):
 		self.assertEqual(len(ip_6.opts[0].opts), 2)
 		self.assertEqual(ip_6.opts[0].opts[0].type, 5)
 		self.assertEqual(ip_6.opts[0].opts[1].type, 1)
+		print("> changing nested options")
+		# change inside nested TriggerList followed by change of the outer option
+		ip_6.opts[0].opts[0].len = 4
+		ip_6.opts[0].nxt = 17
+		ip_6_changed = ip6.IP6(ip_6.bin())
+		self.assertEqual(ip_6_changed.opts[0].nxt, 17)
+		self.assertEqual(ip_6_changed.opts[0].opts[0].len, 4)
 
 
 class ChecksumTestCase(unittest.TestCase):
@@ -598,6 +621,10 @@ class ChecksumTestCase(unittest.TestCase):
 		print(len(udp))
 		csum = checksum.in_cksum(pseudoheader + udp)
 		self.assertEqual(csum, 0x32bf)
+		# odd length: padded by zero byte -> 0x0102 + 0x0300
+		self.assertEqual(checksum.in_cksum(b"\x01\x02\x03"), 0xfbfd)
+		self.assertEqual(checksum.in_cksum(b"\x00\x00"), 0xffff)
+		self.assertEqual(checksum.in_cksum(b"\xff\xff"), 0x0000)
 
 	def test_fletcher_checksum(self):
 		print_header("fletcher checksum")
@@ -1285,6 +1312,15 @@ class RadiotapTestCase(unittest.TestCase):
 		self.assertNotEqual(rad.present_flags & radiotap.RATE_MASK, 0)
 		# self.assertTrue(len(rad.fields) == 7)
 
+		# radiotap: flags (FCS present), rate + IEEE80211 ACK + FCS
+		s = b"\x00\x00\x0a\x00\x06\x00\x00\x00\x10\x02" + b"\xd4\x00\x00\x00\xff\xff\xff\xff\xff\xff" +\
+			b"\x01\x02\x03\x04"
+		rad = radiotap.Radiotap(s)
+		self.assertEqual(rad.fcs, b"\x01\x02\x03\x04")
+		self.assertEqual(len(rad.flags), 2)
+		self.assertEqual(rad.body_bytes, s[10:-4])
+		self.assertEqual(rad.bin(), s)
+
 
 class PerfTestCase(unittest.TestCase):
 	def test_perf(self):
@@ -1776,6 +1812,23 @@ class StaticsTestCase(unittest.TestCase):
 		dns_bytes = b"\x03www\x05test1\x05test2\x02de\x00"
 		self.assertEqual(dns_string, pypacker.dns_name_decode(dns_bytes))
 		self.assertEqual(dns_bytes, pypacker.dns_name_encode(dns_string))
+		self.assertEqual(dns_string, pypacker.dns_name_decode(bytearray(dns_bytes)))
+		self.assertEqual(dns_string, pypacker.dns_name_decode(memoryview(dns_bytes)))
+
+	def test_bytes_like(self):
+		mac_bytes = b"\x01\x02\x03\xaa\xbb\xcc"
+		ip_bytes = b"\x7f\x00\x00\x01"
+
+		for conv in [bytes, bytearray, memoryview]:
+			self.assertEqual(pypacker.mac_bytes_to_str(conv(mac_bytes)), "01:02:03:AA:BB:CC")
+			self.assertEqual(pypacker.ip4_bytes_to_str(conv(ip_bytes)), "127.0.0.1")
+
+	def test_ip4(self):
+		self.assertEqual(pypacker.ip4_str_to_bytes("127.0.0.1"), b"\x7f\x00\x00\x01")
+		self.assertEqual(pypacker.ip4_str_to_bytes("127.000.000.001"), b"\x7f\x00\x00\x01")
+
+		for ip_str in ["abc", "1.2.3", "1.2.3.x", "1.2.3.256"]:
+			self.assertRaises(ValueError, pypacker.ip4_str_to_bytes, ip_str)
 
 
 class DNS2TestCase(unittest.TestCase):